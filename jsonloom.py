@@ -65,13 +65,16 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
+import mmap
 import os
 import re
 import sys
 import ast
 import base64
-from copy import deepcopy
-from typing import Any, Dict, List, Mapping
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple, Union
 
 # Optional BSON support
 _HAS_BSON = True
@@ -86,47 +89,109 @@ except Exception:
         _HAS_BSON = False
         BSONBinary = None  # type: ignore
 
+# Optional orjson support (much faster JSON serialization); stdlib json otherwise
+_HAS_ORJSON = True
+try:
+    import orjson  # type: ignore
+except Exception:
+    _HAS_ORJSON = False
+
 Alias = str
 IdStr = str
-Index = Dict[IdStr, Any]
+# Index keys: canonical integer ids are stored as int, everything else as (interned) str
+IdKey = Union[int, str]
+Index = Dict[IdKey, Any]
 Indexes = Dict[Alias, Index]
+# Secondary indexes for field-qualified $ref: alias -> field -> str(value) -> records
+FieldIndex = Dict[str, List[Mapping[str, Any]]]
+SecondaryIndexes = Dict[Alias, Dict[str, FieldIndex]]
+# id() of referenced import records -> True if the record holds no $ref at any depth
+RefFree = Dict[int, bool]
+# (alias, field, id) of a $ref, used for circular-reference detection
+RefKey = Tuple[Alias, Optional[str], str]
+# Parsed $ref: (shape, alias, field, id, array values); see compile_ref
+CompiledRef = Tuple[int, Alias, Optional[str], str, Tuple[str, ...]]
+# Resolved $ref results keyed by (alias, field, id, $alias items); shared across the output
+ResolveCache = Dict[Tuple[Alias, Optional[str], str, Optional[Tuple[Tuple[str, str], ...]]], Any]
 
 
 def eprint(*args, **kwargs):
     print(*args, file=sys.stderr, **kwargs)
 
 
+# Upper bound on threads used to load $imports files concurrently
+MAX_LOAD_WORKERS = 8
+
 ALIAS_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
 
-# Whitespace-tolerant $ref like "alias:id", "alias :   id", and "alias . field : id"
-REF_RE = re.compile(
-    r"""^\s*([A-Za-z][A-Za-z0-9_]*)          # alias
-        \s*(?:\.\s*([A-Za-z][A-Za-z0-9_]*))? # optional .field (spaces allowed)
-        \s*:\s*
-        (.+?)\s*$                            # value
-    """, re.X
-)
+
+def build_field_index(index: Index, field: str) -> FieldIndex:
+    """Group an index's records by str(rec[field]) in a single pass (insertion order kept)."""
+    out: FieldIndex = {}
+    bucket_for = out.get
+    for rec in index.values():
+        # one lookup per record; records lacking the field are skipped
+        try:
+            key = str(rec[field])
+        except (KeyError, TypeError):
+            continue
+        bucket = bucket_for(key)
+        if bucket is None:
+            out[key] = [rec]
+        else:
+            bucket.append(rec)
+    return out
+
+
+def _field_index(index: Index, field: str, secondary: Dict[str, FieldIndex] | None) -> FieldIndex:
+    """Return the field index for `field`, building it once per (alias, field) when memoized."""
+    if secondary is None:
+        return build_field_index(index, field)
+    fidx = secondary.get(field)
+    if fidx is None:
+        fidx = secondary[field] = build_field_index(index, field)
+    return fidx
 
 
-def lookup_record(index: Index, field: str | None, val: str) -> Mapping[str, Any] | None:
+def id_key(val: IdStr) -> IdKey:
+    """
+    Map an id string to its index key: canonical integers ("0", "42", "-7", but not
+    "007" or "+1") become int, so str(key) always round-trips; anything else stays str.
+    """
+    digits = val[1:] if val[:1] == "-" else val
+    if (
+        0 < len(digits) <= 18
+        and digits.isascii()
+        and digits.isdigit()
+        and (digits[0] != "0" or val == "0")
+    ):
+        return int(val)
+    return val
+
+
+def lookup_record(
+    index: Index,
+    field: str | None,
+    val: str,
+    secondary: Dict[str, FieldIndex] | None = None,
+) -> Mapping[str, Any] | None:
     if field is None:
-        return index.get(val)  # fast path
-    for rec in index.values():
-        if isinstance(rec, dict) and field in rec and str(rec[field]) == val:
-            return rec
-    return None
+        return index.get(id_key(val))  # fast path
+    matches = _field_index(index, field, secondary).get(val)
+    return matches[0] if matches else None
 
 
-def lookup_records(index: Index, field: str | None, val: str) -> List[Mapping[str, Any]]:
+def lookup_records(
+    index: Index,
+    field: str | None,
+    val: str,
+    secondary: Dict[str, FieldIndex] | None = None,
+) -> List[Mapping[str, Any]]:
     """Return all matching records when a field qualifier is used; empty list if none."""
     if field is None:
-        rec = index.get(val)
+        rec = index.get(id_key(val))
         return [rec] if rec is not None else []
-    out: List[Mapping[str, Any]] = []
-    for rec in index.values():
-        if isinstance(rec, dict) and field in rec and str(rec[field]) == val:
-            out.append(rec)
-    return out
+    return _field_index(index, field, secondary).get(val, [])
 
 
 def validate_alias(alias: str) -> None:
@@ -143,6 +208,7 @@ def load_any(path: str) -> Any:
     ext = _ext(path)
     if ext == ".json":
         try:
+            # stdlib, not orjson: orjson parses no faster here and its dicts take more memory
             with open(path, "r", encoding="utf-8") as f:
                 return json.load(f)
         except FileNotFoundError:
@@ -158,15 +224,16 @@ def load_any(path: str) -> Any:
             )
         try:
             with open(path, "rb") as f:
-                data = f.read()
-            # Try to decode a single document first; if that fails, fall back to decode_all
-            try:
-                return BSON(data).decode()
-            except Exception:
-                docs = decode_all(data)
-                if len(docs) == 1:
-                    return docs[0]
-                return docs  # list of docs
+                # Map the file instead of reading it into one bytes object; decode_all
+                # reads documents straight from the mapping (an empty file can't be mapped)
+                if os.fstat(f.fileno()).st_size == 0:
+                    docs = []
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        docs = decode_all(mm)
+            if len(docs) == 1:
+                return docs[0]
+            return docs  # list of docs
         except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {path}")
         except Exception as ex:
@@ -176,34 +243,92 @@ def load_any(path: str) -> Any:
         raise ValueError(f"Unsupported file extension for '{path}'. Use .json or .bson")
 
 
-def _to_json_safe(obj: Any, base64_binary: bool) -> Any:
+class LoomEncoder(json.JSONEncoder):
     """
-    Recursively convert a Python object to something json.dump can handle.
-    If base64_binary=True, BSON Binary values become base64 strings.
+    JSON encoder that handles BSON Binary values while json.dump streams the tree.
+    If base64_binary=True, Binary values become base64 strings.
     Otherwise, encountering a Binary will raise a TypeError.
     """
-    if _HAS_BSON and BSONBinary is not None and isinstance(obj, BSONBinary):
-        if base64_binary:
-            return base64.b64encode(bytes(obj)).decode("ascii")
-        raise TypeError(
-            "Encountered BSON Binary while writing JSON. Use --base64-binary or output .bson"
-        )
 
-    if isinstance(obj, dict):
-        return {k: _to_json_safe(v, base64_binary) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_to_json_safe(v, base64_binary) for v in obj]
-    return obj
+    def __init__(self, *args: Any, base64_binary: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.base64_binary = base64_binary
+
+    def default(self, o: Any) -> Any:
+        if _HAS_BSON and BSONBinary is not None and isinstance(o, BSONBinary):
+            if self.base64_binary:
+                return base64.b64encode(bytes(o)).decode("ascii")
+            raise TypeError(
+                "Encountered BSON Binary while writing JSON. Use --base64-binary or output .bson"
+            )
+        return super().default(o)
+
+
+def contains_nonfinite(obj: Any) -> bool:
+    """True if obj holds a NaN or ±Infinity float at any depth (shared subtrees walked once)."""
+    stack = [obj]
+    walked: Set[int] = set()
+    while stack:
+        cur = stack.pop()
+        t = type(cur)
+        if t is dict or t is list:
+            if id(cur) not in walked:
+                walked.add(id(cur))
+                stack.extend(cur.values() if t is dict else cur)
+        elif isinstance(cur, float) and not math.isfinite(cur):
+            return True
+    return False
+
+
+def _orjson_dumps(obj: Any, default: Callable[[Any], Any]) -> bytes | None:
+    """
+    Serialize obj with orjson at indent 2, or return None if orjson can't encode it.
+    OPT_NON_STR_KEYS (needed for e.g. a numeric $alias target) slows down every
+    object, so it is only tried after the plain encode fails. datetime and dataclass
+    values are passed to default, so they fail here exactly as they do in stdlib json.
+    """
+    base = orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    for option in (base, base | orjson.OPT_NON_STR_KEYS):
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except orjson.JSONEncodeError:
+            continue
+    return None
 
 
 def write_any(path: str, obj: Any, indent: int = 2, base64_binary: bool = False) -> None:
     """Write obj to .json (text) or .bson (binary) based on extension."""
     ext = _ext(path)
     if ext == ".json":
-        safe = _to_json_safe(obj, base64_binary)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(safe, f, ensure_ascii=False, indent=indent)
-            f.write("\n")
+        if _HAS_ORJSON and indent == 2:
+            # orjson only indents by 2; other --indent values use stdlib below.
+            # On failure, fall through so stdlib raises the descriptive error.
+            data = _orjson_dumps(obj, LoomEncoder(base64_binary=base64_binary).default)
+            # orjson writes NaN/±Infinity as null; stdlib keeps them, so any output
+            # containing a null is only used once the tree is known to hold neither
+            if data is not None and (b"null" not in data or not contains_nonfinite(obj)):
+                with open(path, "wb") as f:
+                    f.write(data)
+                    f.write(b"\n")
+                return
+        # json.dump streams and can fail partway (e.g. on a Binary), so write beside the
+        # target and only replace it once the output is complete
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    obj,
+                    f,
+                    cls=LoomEncoder,
+                    base64_binary=base64_binary,
+                    ensure_ascii=False,
+                    indent=indent,
+                )
+                f.write("\n")
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, path)
     elif ext == ".bson":
         if not _HAS_BSON:
             raise RuntimeError(
@@ -215,8 +340,9 @@ def write_any(path: str, obj: Any, indent: int = 2, base64_binary: bool = False)
                 "BSON output expects a single document (object), but got a list. "
                 "Wrap your output or export to .json instead."
             )
+        data = BSON.encode(obj)
         with open(path, "wb") as f:
-            f.write(BSON.encode(obj))
+            f.write(data)
     else:
         raise ValueError(f"Unsupported output extension for '{path}'. Use .json or .bson")
 
@@ -225,28 +351,65 @@ def infer_id_field_from_array(arr: List[Mapping[str, Any]]) -> str | None:
     first_obj = next((x for x in arr if isinstance(x, dict)), None)
     if not first_obj:
         return None
-    keys = list(first_obj.keys())
-    if "id" in keys:
+    if "id" in first_obj:
         return "id"
-    for k in keys:
-        if k.endswith("_id"):
-            return k
-    return None
+    return next((k for k in first_obj if k.endswith("_id")), None)
+
+
+def contains_ref(obj: Any) -> bool:
+    """True if obj holds a $ref key at any depth."""
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            if "$ref" in cur:
+                return True
+            stack.extend(cur.values())
+        elif isinstance(cur, list):
+            stack.extend(cur)
+    return False
+
+
+def _is_ref_free(rec: Any, ref_free: RefFree) -> bool:
+    """contains_ref for an import record, walked once the first time it is referenced."""
+    flag = ref_free.get(id(rec))
+    if flag is None:
+        flag = ref_free[id(rec)] = not contains_ref(rec)
+    return flag
+
+
+# Integer ids with at most 18 digits, which id_key keeps as int
+_MAX_INT_KEY = 10**18
+
+
+def _index_key(val: Any) -> IdKey:
+    if type(val) is int and -_MAX_INT_KEY < val < _MAX_INT_KEY:
+        return val  # same as id_key(str(val)), without the round-trip
+    key = id_key(str(val))
+    # Interned so equal string ids across imports share one object
+    return sys.intern(key) if type(key) is str else key
+
+
+def _raise_duplicate(alias: str, keys: List[IdKey]) -> None:
+    seen: Set[IdKey] = set()
+    for key in keys:
+        if key in seen:
+            raise ValueError(f"Import '{alias}': duplicate id '{key}'")
+        seen.add(key)
 
 
 def index_import(alias: str, raw: Any) -> Index:
-    idx: Index = {}
     if isinstance(raw, list):
         id_field = infer_id_field_from_array(raw) or "id"
-        for rec in raw:
-            if not isinstance(rec, dict):
-                raise ValueError(f"Import '{alias}': array entries must be JSON objects")
-            if id_field not in rec:
-                raise ValueError(f"Import '{alias}': record missing id field '{id_field}'")
-            key = str(rec[id_field])
-            if key in idx:
-                raise ValueError(f"Import '{alias}': duplicate id '{key}'")
-            idx[key] = rec
+        if not all(isinstance(rec, dict) for rec in raw):
+            raise ValueError(f"Import '{alias}': array entries must be JSON objects")
+        try:
+            keys = [_index_key(rec[id_field]) for rec in raw]
+        except KeyError:
+            raise ValueError(f"Import '{alias}': record missing id field '{id_field}'")
+        idx: Index = dict(zip(keys, raw))
+        if len(idx) != len(keys):
+            _raise_duplicate(alias, keys)
         return idx
 
     if isinstance(raw, dict):
@@ -255,9 +418,10 @@ def index_import(alias: str, raw: Any) -> Index:
                 raise ValueError(
                     f"Import '{alias}': object entries must be JSON objects. Offender key='{key}'"
                 )
-            if key in idx:
-                raise ValueError(f"Import '{alias}': duplicate id '{key}'")
-            idx[str(key)] = rec
+        keys = [_index_key(key) for key in raw]
+        idx = dict(zip(keys, raw.values()))
+        if len(idx) != len(keys):
+            _raise_duplicate(alias, keys)
         return idx
 
     raise ValueError(f"Import '{alias}': must be an object or an array")
@@ -266,21 +430,105 @@ def index_import(alias: str, raw: Any) -> Index:
 def parse_ref(s: str) -> tuple[str, str | None, str]:
     """
     Parse $ref strings like 'alias:id' while ignoring surrounding whitespace.
-    Accepts: 'alias:id', 'alias:  id', ' alias :   id  '.
-    Returns (alias, id) trimmed.
+    Accepts: 'alias:id', 'alias:  id', ' alias :   id  ', 'alias . field : id'.
+    Returns (alias, field or None, id) trimmed.
+
+    The grammar is fixed-shape (alias[.field]:value), so it is split with str.find
+    rather than a regex; alias and field are still checked against ALIAS_RE.
     """
-    m = REF_RE.match(s)
-    if not m:
+    colon = s.find(":")
+    if colon < 0:
+        raise ValueError(f"Bad $ref '{s}', expected 'alias[:field]:id'")
+    head = s[:colon]
+    id_ = s[colon + 1:].strip()
+    dot = head.find(".")
+    if dot >= 0:
+        alias = head[:dot].strip()
+        field: str | None = head[dot + 1:].strip()
+        if not ALIAS_RE.match(field):
+            raise ValueError(f"Bad $ref '{s}', expected 'alias[:field]:id'")
+    else:
+        alias = head.strip()
+        field = None
+    if not ALIAS_RE.match(alias):
         raise ValueError(f"Bad $ref '{s}', expected 'alias[:field]:id'")
-    alias = m.group(1).strip()
-    field = m.group(2).strip() if m.group(2) else None
-    id_   = m.group(3).strip()
-    validate_alias(alias)
     if not id_:
         raise ValueError(f"Bad $ref '{s}', empty id")
     return alias, field, id_
 
 
+# $ref shapes, decided once per distinct $ref string by compile_ref
+REF_ID = 0     # "alias:id"            -> one record
+REF_FIELD = 1  # "alias.field:value"   -> all matches
+REF_ARRAY = 2  # "alias.field:[v, ...]" -> all matches for each value
+
+
+def compile_ref(s: str) -> CompiledRef:
+    """
+    Parse a $ref string into (shape, alias, field, id, values).
+    Array-form ids are literal_eval'd here, once; values holds the stringified
+    items for REF_ARRAY and is empty for the other shapes.
+    """
+    alias, field, id_ = parse_ref(s)
+    if id_.startswith("[") and id_.endswith("]"):
+        # Try to parse id_ as a Python literal list
+        try:
+            values = ast.literal_eval(id_)
+            if not isinstance(values, list):
+                raise ValueError
+        except Exception:
+            raise ValueError(f"Bad $ref array syntax: {id_}")
+        return REF_ARRAY, alias, field, id_, tuple(str(v) for v in values)
+    if field is not None:
+        return REF_FIELD, alias, field, id_, ()
+    return REF_ID, alias, None, id_, ()
+
+
+# Projections up to this many (str) fields are code-generated; others loop over pairs
+MAX_GENERATED_PROJECTION = 16
+
+Projection = Callable[[Mapping[str, Any]], Dict[str, Any]]
+
+
+def _missing_field(src: str, strict_projection: bool) -> None:
+    msg = f"Alias: field '{src}' not found"
+    if strict_projection:
+        raise ValueError(msg)
+    eprint("[weave warning]", msg)
+
+
+@lru_cache(maxsize=256)
+def _compile_projection(pairs: Tuple[Tuple[str, str], ...], strict_projection: bool) -> Projection:
+    """Compile $alias (src, dst) pairs into obj -> projected dict, memoized per pairs/strictness."""
+    generate = len(pairs) <= MAX_GENERATED_PROJECTION and all(
+        type(src) is str and type(dst) is str for src, dst in pairs
+    )
+    if not generate:
+        def project(obj: Mapping[str, Any]) -> Dict[str, Any]:
+            out: Dict[str, Any] = {}
+            for src, dst in pairs:
+                if src not in obj:
+                    _missing_field(src, strict_projection)
+                    continue
+                out[dst] = obj[src]
+            return out
+        return project
+
+    # One straight-line assignment per field, e.g.:
+    #   if 'name' in obj: out['supplier_name'] = obj['name']
+    #   else: _missing('name', strict)
+    lines = ["def project(obj):", "    out = {}"]
+    for src, dst in pairs:
+        lines.append(f"    if {src!r} in obj: out[{dst!r}] = obj[{src!r}]")
+        lines.append(f"    else: _missing({src!r}, strict)")
+    lines.append("    return out")
+    namespace: Dict[str, Any] = {"_missing": _missing_field, "strict": strict_projection}
+    exec("\n".join(lines), namespace)
+    return namespace["project"]
+
+
+# Compatibility shim for callers outside this module; resolve_node calls
+# _compile_projection directly with the $alias items it already keys its cache on
 def apply_alias(
     obj: Mapping[str, Any],
     alias: Mapping[str, str] | None,
@@ -288,105 +536,190 @@ def apply_alias(
 ) -> Dict[str, Any]:
     if not alias:
         return dict(obj)
-    out: Dict[str, Any] = {}
-    for src, dst in alias.items():
-        if src not in obj:
-            msg = f"Alias: field '{src}' not found"
-            if strict_projection:
-                raise ValueError(msg)
-            eprint("[weave warning]", msg)
-            continue
-        out[dst] = obj[src]
-    return out
+    return _compile_projection(tuple(alias.items()), strict_projection)(obj)
+
+
+# Work-stack marker: the $ref it was pushed for has been fully walked
+_LEAVE_REF = object()
+
+
+def _push_record_walk(
+    push: Callable[[Tuple[Any, Any, Any]], None],
+    parent: Any,
+    slot: Any,
+    rec: Dict[str, Any],
+    owned: bool,
+) -> None:
+    """
+    Queue the walk of a referenced record that may contain nested $refs. A record
+    that is already a fresh dict (a $alias projection) is walked in place:
+    only its nested containers are queued, skipping a second top-level copy. Shared
+    import records, or a projection that produced a top-level "$ref", get a full walk.
+    """
+    if owned and "$ref" not in rec:
+        for k, v in reversed(rec.items()):
+            t = type(v)
+            if t is dict or t is list:
+                push((rec, k, v))
+    else:
+        push((parent, slot, rec))
+
+
+def _format_ref_key(key: RefKey) -> str:
+    alias, field, id_ = key
+    return f"{alias}.{field}:{id_}" if field is not None else f"{alias}:{id_}"
 
 
 def resolve_node(
     node: Any,
     indexes: Indexes,
-    seen_stack: List[str],
+    seen: Set[RefKey],
     strict_projection: bool,
+    secondary: SecondaryIndexes | None = None,
+    ref_free: RefFree | None = None,
+    resolve_cache: ResolveCache | None = None,
 ) -> Any:
-    if isinstance(node, list):
-        return [resolve_node(n, indexes, seen_stack, strict_projection) for n in node]
+    """
+    Resolve every $ref under node and return the compiled tree. Imported records and
+    repeated $ref results are shared into the output, so treat it as read-only.
+    """
+    if secondary is None:
+        secondary = {}
+    if ref_free is None:
+        ref_free = {}
+    if resolve_cache is None:
+        resolve_cache = {}
+    # Each distinct $ref string is parsed once per call
+    compiled_refs: Dict[str, CompiledRef] = {}
+
+    # Depth-first over (parent, slot, node) work items instead of recursion, so nesting
+    # depth can't hit the recursion limit. Each container is copied into its parent
+    # slot, then its list/dict children are pushed in reverse to keep document order.
+    root: List[Any] = [None]
+    work: List[Tuple[Any, Any, Any]] = [(root, 0, node)]
+    pop = work.pop
+    push = work.append
+    while work:
+        parent, slot, cur = pop()
+        if parent is _LEAVE_REF:
+            # slot is the (container, key) holding the finished result; cur its cache key
+            seen.discard(cur[:3])
+            done_parent, done_slot = slot
+            resolve_cache[cur] = done_parent[done_slot]
+            continue
+
+        # Exact type checks: every loader (json, bson) yields plain dict/list
+        t = type(cur)
+        if t is list:
+            out_list = list(cur)
+            parent[slot] = out_list
+            for i in range(len(cur) - 1, -1, -1):
+                t = type(cur[i])
+                if t is dict or t is list:
+                    push((out_list, i, cur[i]))
+            continue
+
+        if t is not dict:
+            # Primitives
+            parent[slot] = cur
+            continue
 
-    if isinstance(node, dict):
-        # $ref node?
         # $ref node?
-        if "$ref" in node and isinstance(node["$ref"], str):
-            alias, field, id_ = parse_ref(node["$ref"])
-
-            # Try to parse id_ as a Python literal list
-            if id_.startswith("[") and id_.endswith("]"):
-                try:
-                    values = ast.literal_eval(id_)
-                    if not isinstance(values, list):
-                        raise ValueError
-                except Exception:
-                    raise ValueError(f"Bad $ref array syntax: {id_}")
-
-                results: List[Any] = []
+        ref = cur.get("$ref")
+        if type(ref) is str:
+            compiled = compiled_refs.get(ref)
+            if compiled is None:
+                compiled = compiled_refs[ref] = compile_ref(ref)
+            shape, alias, field, id_, values = compiled
+            projection = cur.get("$alias")
+
+            # seen holds every $ref being walked; the error chain is rebuilt from the
+            # pending _LEAVE_REF markers, which sit on the stack in the order entered
+            key = (alias, field, id_)
+            if key in seen:
+                chain = [_format_ref_key(item[2][:3]) for item in work if item[0] is _LEAVE_REF]
+                chain.append(_format_ref_key(key))
+                raise ValueError(f"Circular reference detected: {' -> '.join(chain)}")
+
+            # Ref-free records skip the walk, unless $alias renames a field to "$ref".
+            # _is_ref_free walks a record on its first reference only (memoized by id)
+            walk_all = bool(projection) and "$ref" in projection.values()
+
+            # Identical $ref + $alias pairs resolve to the same (shared) subtree
+            pairs = tuple(projection.items()) if projection else None
+            cache_key = (alias, field, id_, pairs)
+            if cache_key in resolve_cache:
+                parent[slot] = resolve_cache[cache_key]
+                continue
+
+            project = _compile_projection(pairs, strict_projection) if pairs else None
+
+            if shape == REF_ARRAY:
+                recs: List[Mapping[str, Any]] = []
                 for v in values:
-                    matches = lookup_records(indexes[alias], field, str(v))
+                    matches = lookup_records(
+                        indexes[alias], field, v, secondary.setdefault(alias, {})
+                    )
                     if not matches:
                         raise ValueError(f"Missing record for {alias}.{field} = {v}")
-                    for rec in matches:
-                        base = deepcopy(rec)
-                        aliased = apply_alias(base, node.get("$alias"), strict_projection)
-                        results.append(resolve_node(aliased, indexes, seen_stack, strict_projection))
-                return results
+                    recs.extend(matches)
 
             # If a field qualifier is present (alias.field:id), return ALL matches as a list.
-            if field is not None:
-                key = f"{alias}.{field}:{id_}"
-                if key in seen_stack:
-                    raise ValueError(
-                        f"Circular reference detected: {' -> '.join(seen_stack)} -> {key}"
-                    )
+            elif shape == REF_FIELD:
                 if alias not in indexes:
-                    raise ValueError(f"Unknown alias '{alias}' in $ref '{node['$ref']}'")
+                    raise ValueError(f"Unknown alias '{alias}' in $ref '{ref}'")
 
-                matches = lookup_records(indexes[alias], field, str(id_))
-                if not matches:
+                recs = lookup_records(indexes[alias], field, id_, secondary.setdefault(alias, {}))
+                if not recs:
                     raise ValueError(f"Missing record for {alias}.{field} = {id_}")
 
-                seen_stack.append(key)
-                out_list: List[Dict[str, Any]] = []
-                for rec in matches:
-                    base = deepcopy(rec)
-                    aliased = apply_alias(base, node.get("$alias"), strict_projection)
-                    resolved = resolve_node(aliased, indexes, seen_stack, strict_projection)
-                    out_list.append(resolved)
-                seen_stack.pop()
-                return out_list
-
             # No field qualifier: single-record lookup by id (existing behavior)
-            key = f"{alias}:{id_}"
-            if key in seen_stack:
-                raise ValueError(
-                    f"Circular reference detected: {' -> '.join(seen_stack)} -> {key}"
-                )
-            if alias not in indexes:
-                raise ValueError(f"Unknown alias '{alias}' in $ref '{node['$ref']}'")
-
-            rec = lookup_record(indexes[alias], None, str(id_))
-            if rec is None:
-                raise ValueError(f"Missing record for {alias} = {id_}")
-
-            seen_stack.append(key)
-            base = deepcopy(rec)
-            aliased = apply_alias(base, node.get("$alias"), strict_projection)
-            resolved = resolve_node(aliased, indexes, seen_stack, strict_projection)
-            seen_stack.pop()
-            return resolved
+            else:
+                if alias not in indexes:
+                    raise ValueError(f"Unknown alias '{alias}' in $ref '{ref}'")
+
+                rec = lookup_record(indexes[alias], None, id_)
+                if rec is None:
+                    raise ValueError(f"Missing record for {alias} = {id_}")
+
+                # Unprojected records go into the output as-is: ref-free ones are shared
+                # with the import (output is never mutated), the rest are copied by the walk
+                aliased = project(rec) if project is not None else rec
+                parent[slot] = aliased
+                if not walk_all and _is_ref_free(rec, ref_free):
+                    resolve_cache[cache_key] = aliased
+                else:
+                    seen.add(key)
+                    push((_LEAVE_REF, (parent, slot), cache_key))
+                    _push_record_walk(push, parent, slot, aliased, owned=aliased is not rec)
+                continue
+
+            if project is not None:
+                out_list = [project(rec) for rec in recs]
+            else:
+                out_list = list(recs)
+            parent[slot] = out_list
+            pending = [
+                i for i, rec in enumerate(recs) if walk_all or not _is_ref_free(rec, ref_free)
+            ]
+            if not pending:
+                resolve_cache[cache_key] = out_list
+                continue
+            seen.add(key)
+            push((_LEAVE_REF, (parent, slot), cache_key))
+            for i in reversed(pending):
+                _push_record_walk(push, out_list, i, out_list[i], owned=out_list[i] is not recs[i])
+            continue
 
-        # Regular object: recurse
-        out: Dict[str, Any] = {}
-        for k, v in node.items():
-            out[k] = resolve_node(v, indexes, seen_stack, strict_projection)
-        return out
+        # Regular object: copy, then walk nested containers
+        out: Dict[str, Any] = dict(cur)
+        parent[slot] = out
+        for k, v in reversed(cur.items()):
+            t = type(v)
+            if t is dict or t is list:
+                push((out, k, v))
 
-    # Primitives
-    return node
+    return root[0]
 
 
 def compile_strict(author_doc: Mapping[str, Any], base_dir: str, strict_projection: bool) -> Any:
@@ -397,20 +730,40 @@ def compile_strict(author_doc: Mapping[str, Any], base_dir: str, strict_projecti
     if not isinstance(imports, dict):
         raise ValueError("$imports must be an object of { alias: path }")
 
-    # Load and index imports relative to the author doc’s directory
-    indexes: Indexes = {}
+    # Resolve import paths relative to the author doc’s directory
+    paths: Dict[Alias, str] = {}
     for alias, rel_path in imports.items():
         validate_alias(alias)
         if not isinstance(rel_path, str) or not rel_path.strip():
             raise ValueError(f"$imports['{alias}'] must be a non-empty string path")
-        abs_path = os.path.normpath(os.path.join(base_dir, rel_path))
-        raw = load_any(abs_path)
-        indexes[alias] = index_import(alias, raw)
-
-    # Remove $imports from root before resolution
-    author_copy = {k: v for k, v in author_doc.items() if k != "$imports"}
+        paths[alias] = os.path.normpath(os.path.join(base_dir, rel_path))
 
-    return resolve_node(author_copy, indexes, seen_stack=[], strict_projection=strict_projection)
+    # Load files concurrently (I/O and C-level decoding overlap), then index in
+    # $imports order so errors surface deterministically
+    indexes: Indexes = {}
+    if paths:
+        unique_paths = list(dict.fromkeys(paths.values()))
+        with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(unique_paths))) as ex:
+            loads = {p: ex.submit(load_any, p) for p in unique_paths}
+            for alias, abs_path in paths.items():
+                raw = loads[abs_path].result()
+                indexes[alias] = index_import(alias, raw)
+
+    # Remove $imports from root before resolution (one C-level dict copy, only if present)
+    author_copy = author_doc
+    if "$imports" in author_doc:
+        author_copy = author_doc.copy()
+        del author_copy["$imports"]
+
+    return resolve_node(
+        author_copy,
+        indexes,
+        seen=set(),
+        strict_projection=strict_projection,
+        secondary={},
+        ref_free={},
+        resolve_cache={},
+    )
 
 
 def main():
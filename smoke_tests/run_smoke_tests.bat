@@ -38,6 +38,11 @@ for %%I in (
   preprocessor_datalarge.json
   preprocessor_inventory_array.json
   preprocessor_binary_copy.json
+  preprocessor_alias_to_ref.json
+  preprocessor_circular_array_ref.json
+  preprocessor_bson_datetime.json
+  preprocessor_id_keys.json
+  preprocessor_id_keys_duplicate.json
 ) do (
   if not exist "%%~I" (
     echo Missing input: %%~I >"%LOG%"
@@ -59,12 +64,17 @@ set "T5=object_map_imports|%LOOM% preprocessor_object_map_imports.json|0"
 set "T6=order_items_array|%LOOM% preprocessor_datalarge.json|0"
 set "T7=inventory_array|%LOOM% preprocessor_inventory_array.json|0"
 set "T8=binary_copy|%LOOM% preprocessor_binary_copy.json|0"
+set "T9=alias_to_ref|%LOOM% preprocessor_alias_to_ref.json|0"
+set "T10=id_keys|%LOOM% preprocessor_id_keys.json|0"
 
 REM --- expected to fail ------------
-set "T9=alias_strict|%LOOM% preprocessor_strict_projection.json --strict-projection|1"
-set "T10=missing_record|%LOOM% preprocessor_missing_record.json|1"
-set "T11=unknown_alias|%LOOM% preprocessor_unknown_alias.json|1"
-set "T12=circular_reference|%LOOM% preprocessor_circular_reference.json|1"
+set "T11=alias_strict|%LOOM% preprocessor_strict_projection.json --strict-projection|1"
+set "T12=missing_record|%LOOM% preprocessor_missing_record.json|1"
+set "T13=unknown_alias|%LOOM% preprocessor_unknown_alias.json|1"
+set "T14=circular_reference|%LOOM% preprocessor_circular_reference.json|1"
+set "T15=circular_array_ref|%LOOM% preprocessor_circular_array_ref.json|1"
+set "T16=bson_datetime|%LOOM% preprocessor_bson_datetime.json|1"
+set "T17=id_keys_duplicate|%LOOM% preprocessor_id_keys_duplicate.json|1"
 
 REM ------------------ run tests ------------------------------
 (
@@ -76,7 +86,7 @@ REM ------------------ run tests ------------------------------
   set "PASS_COUNT=0"
   set "FAIL_COUNT=0"
 
-  for /L %%N in (1,1,12) do (
+  for /L %%N in (1,1,17) do (
     for /f "tokens=1,2,3 delims=|" %%A in ("!T%%N!") do (
       set "LABEL=%%~A"
       set "CMD=%%~B"